@@ -17,6 +17,7 @@
 # Licence:     refer to the LICENSE file
 # -------------------------------------------------------------------------------
 import os.path
+import sys
 from pathlib import Path
 from typing import Union, Optional
 import re
@@ -26,7 +27,7 @@ from .ltspice_utils import TEXT_REGEX, TEXT_REGEX_X, TEXT_REGEX_Y, TEXT_REGEX_AL
     TEXT_REGEX_TEXT, END_LINE_TERM, ASC_ROTATION_DICT, ASC_INV_ROTATION_DICT, asc_text_align_set, asc_text_align_get
 from .spice_editor import SpiceEditor, SpiceCircuit
 from ..utils.file_search import search_file_in_containers
-from .base_editor import format_eng, ComponentNotFoundError, ParameterNotFoundError, PARAM_REGEX, \
+from .base_editor import format_eng, ComponentNotFoundError, ParameterNotFoundError, get_param_regex, \
     UNIQUE_SIMULATION_DOT_INSTRUCTIONS
 from .base_schematic import (BaseSchematic, Point, Line, Text, SchematicComponent, ERotation, TextTypeEnum, Port)
 from .asy_reader import AsyReader
@@ -132,7 +133,7 @@ class AscEditor(BaseSchematic):
                     tag, ref, text = line.split(maxsplit=2)
                     text = text.strip()  # Gets rid of the \n terminator
                     if ref == "InstName":
-                        component.reference = text
+                        component.reference = sys.intern(text)  # References are repeatedly used as dictionary keys
                         symbol = self._get_symbol(component.symbol)
                         if component.reference.startswith('X') or symbol.is_subcircuit():  # This is a subcircuit
                             # then create the attribute "SUBCKT"
@@ -254,15 +255,15 @@ class AscEditor(BaseSchematic):
         return None, None
 
     def get_parameter(self, param: str) -> str:
-        param_regex = re.compile(PARAM_REGEX % param, re.IGNORECASE)
+        param_regex = get_param_regex(param)
         match, directive = self._get_directive(".PARAM", param_regex)
         if match:
             return match.group('value')
         else:
-            raise ParameterNotFoundError(f"Parameter {param} not found in ASC file")
+            raise ParameterNotFoundError(param)
 
     def set_parameter(self, param: str, value: Union[str, int, float]) -> None:
-        param_regex = re.compile(PARAM_REGEX % param, re.IGNORECASE)
+        param_regex = get_param_regex(param)
         match, directive = self._get_directive(".PARAM", param_regex)
         if match:
             _logger.debug(f"Parameter {param} found in ASC file, updating it")
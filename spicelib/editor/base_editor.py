@@ -21,11 +21,12 @@ __version__ = "0.1.0"
 
 
 from abc import ABC, abstractmethod
-from collections import OrderedDict
-from math import floor, log
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Union, Tuple
 import logging
+import re
+import sys
 
 
 __author__ = "Nuno Canto Brum <nuno.brum@gmail.com>"
@@ -36,8 +37,9 @@ _logger = logging.getLogger("spicelib.BaseEditor")
 SUBCKT_DIVIDER = ':'  #: This controls the sub-circuit divider when setting component values inside sub-circuits.
 # Ex: Editor.set_component_value('XU1:R1', '1k')
 
-UNIQUE_SIMULATION_DOT_INSTRUCTIONS = ('.AC', '.DC', '.TRAN', '.NOISE', '.DC', '.TF')
-SPICE_DOT_INSTRUCTIONS = (
+# The instructions are kept in frozensets, so that membership tests are O(1)
+UNIQUE_SIMULATION_DOT_INSTRUCTIONS = frozenset(('.AC', '.DC', '.TRAN', '.NOISE', '.TF'))
+SPICE_DOT_INSTRUCTIONS = frozenset((
     '.BACKANNO',
     '.END',
     '.ENDS',
@@ -65,8 +67,94 @@ SPICE_DOT_INSTRUCTIONS = (
     '.TEXT',
     '.WAVE',  # Write Selected Nodes to a .Wav File
 
+))
+PARAM_REGEX = r"(?<= )(?P<replace>%s(\s*=\s*)(?P<value>[\w*/.+\-{}()\t ]*))(?<!\s)($|\s+)(?!\s*=)"
+
+
+@lru_cache(maxsize=256)
+def get_param_regex(name: str) -> re.Pattern:
+    """
+    Returns the compiled PARAM_REGEX for the given parameter name. The compiled expressions are kept in a bounded
+    cache, so that repeated accesses to the same parameter, which is typical on parameter sweeps, don't re-compile
+    the pattern.
+
+    :param name: Name of the parameter
+    :type name: str
+    :return: Compiled regular expression that matches the parameter assignment
+    :rtype: re.Pattern
+    """
+    return re.compile(PARAM_REGEX % re.escape(name), re.IGNORECASE)
+
+
+_PARAM_VALUE_CHARS = frozenset('*/.+-{}()\t _')  # Characters accepted in a value, on top of the alphanumeric ones
+
+
+def find_param(line: str, name: str) -> Union[Tuple[int, int], None]:
+    """
+    Searches for the assignment of a parameter in a line. It is equivalent to searching the line with the
+    PARAM_REGEX, but it is done in a single pass over the line, without the backtracking of the regular expression.
+    The search is case-insensitive.
+
+    :param line: Line of text to search, for example a .PARAM instruction
+    :type line: str
+    :param name: Name of the parameter
+    :type name: str
+    :return: Start and stop indexes of the 'name=value' assignment, or None if the parameter wasn't found.
+        The value is found after the first '=' sign of this slice.
+    :rtype: tuple(int, int) or None
+    """
+    line_lower = line.lower()
+    name_lower = name.lower()
+    if len(line_lower) != len(line) or len(name_lower) != len(name):
+        # Some unicode characters change size when converted to lower case. Using the regular expression instead.
+        m = get_param_regex(name).search(line)
+        return m.span('replace') if m else None
+    size = len(line)
+    pos = line_lower.find(name_lower, 1)
+    while pos != -1:
+        next_pos = pos + 1
+        if line[pos - 1] == ' ':  # The parameter must be preceded by a blank space
+            i = pos + len(name)
+            while i < size and line[i].isspace():
+                i += 1
+            if i < size and line[i] == '=':
+                i += 1
+                equal_end = i
+                while i < size and line[i].isspace():
+                    i += 1
+                value_start = i
+                while i < size and (line[i].isalnum() or line[i] in _PARAM_VALUE_CHARS):
+                    i += 1
+                # The value can't end with spaces nor can be followed by another '='. Retreats until this holds.
+                # As a last resort, the value is empty and the assignment ends just after the '=' sign.
+                while i >= equal_end:
+                    if i < value_start:
+                        i = equal_end
+                    if not line[i - 1].isspace():
+                        if i == size or (i == size - 1 and line[i] == '\n'):
+                            return pos, i
+                        if line[i].isspace():
+                            j = i + 1
+                            while j < size and line[j].isspace():
+                                j += 1
+                            if j == size or line[j] != '=':
+                                return pos, i
+                    i -= 1
+        pos = line_lower.find(name_lower, next_pos)
+    return None
+
+
+# Ranges used by format_eng, sorted by increasing value, starting at 1e-15. Each range is given by its upper limit
+# (excluded), the scale to apply to the value and the suffix to use.
+_ENG_RANGES = (
+    (1e-12, 1e15, 'f'),
+    (1e-9, 1e12, 'p'),
+    (1e-6, 1e9, 'n'),
+    (1e-3, 1e6, 'u'),
+    (1.0, 1e3, 'm'),
+    (1e6, 1e-3, 'k'),
+    (1e9, 1e-6, 'Meg'),
 )
-PARAM_REGEX = r"(?<= )(?P<replace>%s(\s*=\s*)(?P<value>[\w\*\/\.\+\-\/\*\{\}\(\)\t ]*))(?<!\s)($|\s+)(?!\s*=)"
 
 
 def format_eng(value) -> str:
@@ -81,25 +169,46 @@ def format_eng(value) -> str:
         * Meg for Mega (10E+6)
 
 
+    The results are cached, as the same values are typically formatted many times over a simulation sweep.
+
     :param value: float value to format
     :type value: float
     :return: String with the formatted value
     :rtype: str
     """
-    if value == 0.0:
-        return "{:g}".format(value)  # This avoids a problematic log(0), and the int and float conversions
-    e = floor(log(abs(value), 1000))
-    if -5 <= e < 0:
-        suffix = "fpnum"[e]
-    elif e == 0:
+    if value == 0:
+        # 0.0 and -0.0 are equal and have the same hash, so they would share the same cache entry
         return "{:g}".format(value)
-    elif e == 1:
-        suffix = "k"
-    elif e == 2:
-        suffix = 'Meg'
-    else:
-        return '{:E}'.format(value)
-    return '{:g}{:}'.format(value * 1000 ** -e, suffix)
+    return _format_eng(value)
+
+
+@lru_cache(maxsize=4096)
+def _format_eng(value) -> str:
+    """
+    (Private function. Not to be used directly)
+    Cached implementation of format_eng(), for the values other than zero.
+    """
+    av = abs(value)
+    if 1.0 <= av < 1e3:  # The most common case. Doesn't need a suffix
+        return "{:g}".format(value)
+    if av >= 1e-15:
+        for limit, scale, suffix in _ENG_RANGES:
+            if av < limit:
+                return '{:g}{:}'.format(value * scale, suffix)
+    return '{:E}'.format(value)  # Out of the range of the suffixes, or not a number
+
+
+_SI_MUL = {  # Multipliers of the SI prefixes recognized by scan_eng
+    'f': 1.0e-15,
+    'p': 1.0e-12,
+    'n': 1.0e-09,
+    'u': 1.0e-06,
+    'µ': 1.0e-06,
+    'm': 1.0e-03,
+    'k': 1.0e+03,
+    'K': 1.0e+03,  # LTSpice uses the capital K for Kilo
+}
+_UP_TO_LAST_DIGIT_REGEX = re.compile(r".*[0-9]", re.DOTALL)  # Matches the string up to the last digit
 
 
 def scan_eng(value: str) -> float:
@@ -125,25 +234,16 @@ def scan_eng(value: str) -> float:
     """
     # Search for the last digit on the string. Assuming that all after the last number are SI qualifiers and units.
     value = value.strip()
-    x = len(value)
-    while x > 0:
-        if value[x - 1] in "0123456789":
-            break
-        x -= 1
+    if value and '0' <= value[-1] <= '9':  # No suffix: the conversion is done directly by float()
+        return float(value)
+    m = _UP_TO_LAST_DIGIT_REGEX.match(value)
+    x = m.end() if m else 0
     suffix = value[x:]  # this is the non-numeric part at the end
     f = float(value[:x])  # this is the numeric part. Can raise ValueError.
     if suffix:
-        if suffix[0] in "fpnuµmkK":
-            return f * {
-                'f': 1.0e-15,
-                'p': 1.0e-12,
-                'n': 1.0e-09,
-                'u': 1.0e-06,
-                'µ': 1.0e-06,
-                'm': 1.0e-03,
-                'k': 1.0e+03,
-                'K': 1.0e+03,  # LTSpice uses the capital K for Kilo
-            }[suffix[0]]
+        mul = _SI_MUL.get(suffix[0])
+        if mul is not None:
+            return f * mul
         elif suffix.upper().startswith("MEG"):
             return f * 1E+6
     return f
@@ -157,17 +257,55 @@ class ParameterNotFoundError(Exception):
     """ParameterNotFound Error"""
 
     def __init__(self, parameter):
-        super().__init__(f'Parameter "{parameter}" not found')
+        super().__init__(parameter)
+        self.parameter = parameter
+
+    def __str__(self):
+        # The message is only built when it is displayed, so that speculative lookups don't pay for it.
+        return f'Parameter "{self.parameter}" not found'
 
 
 class Component(object):
     """Hols component information"""
+    __slots__ = ('reference', 'attributes', 'ports')
 
     def __init__(self):
         self.reference = ""
-        self.attributes = OrderedDict()
+        self.attributes = {}
         self.ports = []
 
+    @classmethod
+    def from_line(cls, line: str) -> 'Component':
+        """
+        Creates a Component from a simple netlist line in the form "<reference> <node> ... <node> <value>", as
+        used for resistors, capacitors, inductors and sources. The line is split in tokens with str.split(), so no
+        regular expression is involved. Lines with models or parameters should be parsed by the editors instead.
+
+        :param line: Netlist line
+        :type line: str
+        :return: Component with the reference, the ports and the 'value' attribute set
+        :rtype: Component
+        :raises: ValueError - When the line doesn't contain at least the reference and the value
+        """
+        tokens = line.split()
+        if len(tokens) < 2:
+            raise ValueError(f'Line "{line}" doesn\'t contain a reference and a value')
+        component = cls()
+        component.reference = sys.intern(tokens[0])
+        component.ports = [sys.intern(node) for node in tokens[1:-1]]
+        component.attributes['value'] = tokens[-1]
+        return component
+
+    # Components are identified by their reference. This allows collapsing duplicates when components are stored in
+    # sets or used as dictionary keys.
+    def __hash__(self):
+        return hash(self.reference)
+
+    def __eq__(self, other):
+        if isinstance(other, Component):
+            return self.reference == other.reference
+        return NotImplemented
+
 
 class BaseEditor(ABC):
     """
@@ -209,9 +347,33 @@ class BaseEditor(ABC):
         Writes the netlist to a file. This is an alias to save_netlist."""
         self.save_netlist(run_netlist_file)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The write_netlist alias is bound directly to the save_netlist of each subclass, instead of going through
+        # the wrapper above, so that calling it doesn't add an extra call. A write_netlist defined by a subclass is
+        # kept, and so is the one its own subclasses inherit from it.
+        inherited = cls.write_netlist
+        if 'write_netlist' not in cls.__dict__ and (
+                inherited is BaseEditor.write_netlist or
+                any(inherited is base.__dict__.get('save_netlist') for base in cls.__mro__[1:])):
+            cls.write_netlist = cls.save_netlist
+
     @abstractmethod
     def get_component(self, reference: str) -> Component:
-        """Returns the Component object representing the given reference in the netlist."""
+        """
+        Returns the Component object representing the given reference in the netlist.
+
+        This method is called by all the get_component_* methods and by each iteration of set_component_values(),
+        so implementations should resolve the reference through an index keyed by the reference, instead of
+        scanning the whole design. Hierarchical references, using the SUBCKT_DIVIDER, are resolved by descending
+        into the sub-circuit of the first part of the reference.
+
+        :param reference: Reference of the component
+        :type reference: str
+        :return: The Component object
+        :rtype: Component
+        :raises: ComponentNotFoundError - In case the component is not found
+        """
         ...
 
     @abstractmethod
@@ -450,6 +612,18 @@ class BaseEditor(ABC):
         """
         ...
 
+    def add_components(self, *components: Component, **kwargs) -> None:
+        """
+        Adds a list of components to the design. It is the same as calling add_component() for each component, and
+        the kwargs are passed to each call. Editors can override it to add all the components in a single operation.
+
+        :param components: Argument list of components to add
+        :type components: Component
+        :return: Nothing
+        """
+        for component in components:
+            self.add_component(component, **kwargs)
+
     @abstractmethod
     def remove_component(self, designator: str) -> None:
         """
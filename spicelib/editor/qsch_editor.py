@@ -25,7 +25,7 @@ import re
 import logging
 from .base_editor import (
     format_eng, ComponentNotFoundError, ParameterNotFoundError,
-    PARAM_REGEX, UNIQUE_SIMULATION_DOT_INSTRUCTIONS
+    get_param_regex, UNIQUE_SIMULATION_DOT_INSTRUCTIONS
 )
 from .base_schematic import BaseSchematic, SchematicComponent, Point, ERotation, Line, Text, TextTypeEnum
 from ..utils.file_search import find_file_in_directory
@@ -467,7 +467,8 @@ class QschEditor(BaseSchematic):
             texts = symbol.get_items('text')
             if len(texts) < 2:
                 raise RuntimeError(f"Missing texts in component at coordinates {component.get_attr(1)}")
-            refdes = texts[QSCH_SYMBOL_TEXT_REFDES].get_attr(QSCH_TEXT_STR_ATTR)
+            # References are repeatedly used as dictionary keys
+            refdes = sys.intern(texts[QSCH_SYMBOL_TEXT_REFDES].get_attr(QSCH_TEXT_STR_ATTR))
             value = texts[QSCH_SYMBOL_TEXT_VALUE].get_attr(QSCH_TEXT_STR_ATTR)
             sch_comp = SchematicComponent()
             sch_comp.reference = refdes
@@ -567,16 +568,16 @@ class QschEditor(BaseSchematic):
 
     def get_parameter(self, param: str) -> str:
         # docstring inherited from BaseEditor
-        param_regex = re.compile(PARAM_REGEX % param, re.IGNORECASE)
+        param_regex = get_param_regex(param)
         tag, match = self._get_text_matching(".PARAM", param_regex)
         if match:
             return match.group('value')
         else:
-            raise ParameterNotFoundError(f"Parameter {param} not found in QSCH file")
+            raise ParameterNotFoundError(param)
 
     def set_parameter(self, param: str, value: Union[str, int, float]) -> None:
         # docstring inherited from BaseEditor
-        param_regex = re.compile(PARAM_REGEX % param, re.IGNORECASE)
+        param_regex = get_param_regex(param)
         tag, match = self._get_text_matching(".PARAM", param_regex)
         if match:
             _logger.debug(f"Parameter {param} found in QSCH file, updating it")
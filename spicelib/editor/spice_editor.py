@@ -16,12 +16,15 @@
 #
 # Licence:     refer to the LICENSE file
 # -------------------------------------------------------------------------------
+import io
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 import re
 import logging
 
-from .base_editor import BaseEditor, format_eng, ComponentNotFoundError, ParameterNotFoundError, PARAM_REGEX, \
+from .base_editor import BaseEditor, format_eng, ComponentNotFoundError, ParameterNotFoundError, find_param, \
     UNIQUE_SIMULATION_DOT_INSTRUCTIONS, Component, SUBCKT_DIVIDER
 
 from typing import Union, List, Callable, Any, Tuple, Optional
@@ -98,31 +101,123 @@ lib_inc_regex = re.compile(r"^\.(LIB|INC)\s+(.*)$", re.IGNORECASE)
 LibSearchPaths = []
 
 
+# Components with a fixed number of nodes, whose lines are parsed by splitting them in tokens instead of matching them
+# against the REPLACE_REGXES. For each prefix, it indicates the number of nodes and whether the value extends to the
+# end of the line (the ".*" patterns) or is only the first word after the nodes (the "\w+" patterns).
+# Resistors, capacitors and inductors are given the pattern of their value instead. These are only tokenized in the
+# common "<designator> <node> <node> <value>" form, without a model and without braces.
+_TOKENIZED_COMPONENTS = {
+    'B': (2, True), 'F': (2, True), 'H': (2, True), 'I': (2, True), 'V': (2, True), 'W': (2, True),
+    'S': (4, True), 'T': (4, True), 'U': (3, True),
+    'D': (2, False), 'J': (3, False), 'O': (4, False), 'Z': (3, False),
+    'C': (2, re.compile(r"[0-9\.E+-]+(Meg|[kmuµnpf])?F?", re.IGNORECASE)),
+    'L': (2, re.compile(r"[0-9\.E+-]+(Meg|[kmuµnpf])?H?", re.IGNORECASE)),
+    'R': (2, re.compile(r"(R=)?[0-9\.E+-]+(Meg|[kmuµnpf])?R?\d*", re.IGNORECASE)),
+}
+
+
+def _is_word(text: str) -> bool:
+    """(Private function. Not to be used directly) Returns True if the text is made of word characters only."""
+    return text.replace('_', 'a').isalnum()
+
+
+class _ComponentMatch(object):
+    """Stands for the re.Match object of a component line that was parsed by tokenizing it."""
+    __slots__ = ('_groups', '_spans')
+
+    def __init__(self, groups: dict, spans: dict):
+        self._groups = groups
+        self._spans = spans
+
+    def group(self, name):
+        return self._groups[name]
+
+    def groupdict(self):
+        return self._groups.copy()
+
+    def start(self, name):
+        return self._spans[name][0]
+
+    def end(self, name):
+        return self._spans[name][1]
+
+
+def _match_component(prefix: str, regex: re.Pattern, line: str):
+    """
+    (Private function. Not to be used directly)
+    Matches a component line against its regular expression. The components with a fixed number of nodes are
+    tokenized instead, and the regular expression is only used when the line has an unexpected shape.
+    """
+    shape = _TOKENIZED_COMPONENTS.get(prefix)
+    if shape is not None:
+        n_nodes, value_kind = shape
+        eol = line.find('\n')
+        if eol == -1 or eol == len(line) - 1:  # Lines with inner line feeds are left to the regex
+            tokens = line.split(None, n_nodes + 1)
+            designator = tokens[0] if tokens else ''
+            # The line must start with the designator, which can have a '§' after the prefix
+            if len(tokens) == n_nodes + 2 and line.startswith(designator) and designator[0].upper() == prefix:
+                name = designator[2:] if designator[1:2] == '§' else designator[1:]
+                if _is_word(name):
+                    rest = tokens[-1]
+                    value_start = len(line) - len(rest)
+                    value = ''
+                    if value_kind is True:
+                        value = rest[:-1] if eol != -1 else rest
+                    elif value_kind is False:
+                        value = rest
+                        for i, ch in enumerate(rest):
+                            if not (ch.isalnum() or ch == '_'):
+                                value = rest[:i]
+                                break
+                    elif '{' not in rest and len(rest.split(None, 1)) == 1:  # A single token, without a model
+                        m = value_kind.match(rest)
+                        if m:
+                            value = m.group(0)
+                    if value:
+                        nodes = line[len(designator):value_start].rstrip()
+                        nodes_start = len(designator)
+                        groups = {'designator': designator, 'nodes': nodes}
+                        if 'model' in regex.groupindex:
+                            groups['model'] = None  # Only the lines without a model are tokenized
+                        groups['value'] = value
+                        return _ComponentMatch(
+                            groups,
+                            {'designator': (0, nodes_start), 'nodes': (nodes_start, nodes_start + len(nodes)),
+                             'model': (-1, -1), 'value': (value_start, value_start + len(value))})
+    return regex.match(line)
+
+
+# Maps the first non-blank character of a line to the command it introduces. Directives are handled apart.
+_CMD_TABLE = {ch: ch for ch in REPLACE_REGXES}  # Circuit elements
+_CMD_TABLE.update({ch.lower(): ch for ch in REPLACE_REGXES})
+_CMD_TABLE.update({ch: '*' for ch in "#;*\n\r"})  # Comments and blank lines
+_CMD_TABLE['+'] = '+'  # Line continuations
+_DIR_RE = re.compile(r"\.[^ \t\r\n]*")
+
+
+def _str_line_command(line: str) -> str:
+    # The command is found with a table lookup on the first character, and only directives need a regex. This is
+    # not memoized: a cache keyed on the line text would keep the lines alive after their editors are gone, and
+    # on decks larger than the cache, every lookup would miss and cost more than the classification itself.
+    stripped = line.lstrip(' \t')
+    if not stripped:
+        return '*'  # An empty line
+    cmd = _CMD_TABLE.get(stripped[0])
+    if cmd is not None:
+        return cmd
+    if stripped[0] == '.':  # this is a directive
+        return _DIR_RE.match(stripped).group(0).upper()
+    raise SyntaxError('Unrecognized command in line "%s"' % line)
+
+
 def get_line_command(line) -> str:
     """
     Retrives the type of SPICE command in the line.
     Starts by removing the leading spaces and the evaluates if it is a comment, a directive or a component.
     """
     if isinstance(line, str):
-        for i in range(len(line)):
-            ch = line[i]
-            if ch == ' ' or ch == '\t':
-                continue
-            else:
-                ch = ch.upper()
-                if ch in REPLACE_REGXES:  # A circuit element
-                    return ch
-                elif ch == '+':
-                    return '+'  # This is a line continuation.
-                elif ch in "#;*\n\r":  # It is a comment or a blank line
-                    return "*"
-                elif ch == '.':  # this is a directive
-                    j = i + 1
-                    while j < len(line) and (line[j] not in (' ', '\t', '\r', '\n')):
-                        j += 1
-                    return line[i:j].upper()
-                else:
-                    raise SyntaxError('Unrecognized command in line "%s" of file %s' % line)
+        return _str_line_command(line)
     elif isinstance(line, SpiceCircuit):
         return ".SUBCKT"
     else:
@@ -134,13 +229,96 @@ def _first_token_upped(line):
     (Private function. Not to be used directly)
     Returns the first non-space character in the line. If a point '.' is found, then it gets the primitive associated.
     """
-    i = 0
-    while i < len(line) and line[i] in (' ', '\t'):
-        i += 1
-    j = i
-    while i < len(line) and not (line[i] in (' ', '\t')):
-        i += 1
-    return line[j:i].upper()
+    # Tokens are separated by spaces and tabs only
+    return line.lstrip(' \t').split(' ', 1)[0].split('\t', 1)[0].upper()
+
+
+def _subcircuit_name(line: str) -> Union[str, None]:
+    """
+    (Private function. Not to be used directly)
+    Returns the sub-circuit name of an X instance line, that is, the last token before the "params:" keyword or
+    before the first parameter assignment. Returns None when the line doesn't have the expected shape.
+    """
+    tokens = line.split()
+    end = len(tokens)
+    for i in range(1, len(tokens)):
+        token = tokens[i]
+        if token.lower() == 'params:':
+            end = i
+            break
+        if '=' in token:
+            end = i - 1 if token[0] == '=' else i  # "name =value" or "name = value" puts the name before
+            break
+    if end < 3:  # At least the designator, a node and the sub-circuit name are needed
+        return None
+    name = tokens[end - 1]
+    if not name.replace('_', '').isalnum():
+        return None
+    # All that follows the name must be parameter assignments
+    assignments = ' '.join(tokens[end:]).replace(' =', '=').replace('= ', '=').split()
+    if assignments and assignments[0].lower() == 'params:':
+        del assignments[0]
+    if assignments and assignments[-1] == '\\':
+        del assignments[-1]
+    for assignment in assignments:
+        param, _, value = assignment.partition('=')
+        if not param.replace('_', '').isalnum() or not value or '=' in value:
+            return None
+    return name
+
+
+_library_files = {}  # Existing files of each library include. See _find_library_files()
+
+
+def _find_library_files(lib: str, search_paths: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    (Private function. Not to be used directly)
+    Returns the existing files for a library include, in the order they are to be searched: first the library path
+    as it is given, then the ~username/Documents/LTspiceXVII/lib/sub directory and finally the search paths.
+    The files found are remembered, so that the same library isn't looked for on the disk over and over again. As
+    relative paths depend on it, the working directory is part of the key. The libraries that weren't found aren't
+    remembered, as they can be created later, and the files remembered are checked before being returned.
+    """
+    key = (lib, search_paths, os.getcwd())
+    files = _library_files.get(key)
+    if files is not None and all(os.path.exists(filename) for filename in files):
+        return files
+    candidates = [lib, os.path.join(os.path.expanduser('~'), "Documents\\LTspiceXVII\\lib\\sub", lib)]
+    candidates += [os.path.join(path, lib) for path in search_paths]
+    files = tuple(filename for filename in candidates if os.path.exists(filename))
+    if files:
+        if len(_library_files) >= 256:  # Keeps the memory bounded
+            _library_files.clear()
+        _library_files[key] = files
+    else:
+        _library_files.pop(key, None)
+    return files
+
+
+@lru_cache(maxsize=64)
+def _search_regex(search_pattern: str) -> re.Pattern:
+    """
+    (Private function. Not to be used directly)
+    Returns the compiled case-insensitive regular expression for a search pattern. Scripts tend to remove the same
+    instructions over and over again, so the compiled patterns are cached.
+    """
+    return re.compile(search_pattern, re.IGNORECASE)
+
+
+def _is_hier(reference: str) -> bool:
+    """
+    (Private function. Not to be used directly)
+    Returns true if the reference points to a component inside a sub-circuit instance, ex: XU1:R1
+    """
+    return reference[:1] == 'X' and SUBCKT_DIVIDER in reference
+
+
+def _is_end_line(line) -> bool:
+    """
+    (Private function. Not to be used directly)
+    Returns true if the line is the .END instruction of the netlist
+    """
+    return isinstance(line, str) and line[:4].upper() == '.END'
 
 
 def _is_unique_instruction(instruction):
@@ -152,6 +330,33 @@ def _is_unique_instruction(instruction):
     return cmd in UNIQUE_SIMULATION_DOT_INSTRUCTIONS
 
 
+@lru_cache(maxsize=256)
+def _find_subckt_text(library: str, mtime_ns: int, size: int, subckt_name: str) -> Union[str, None]:
+    """
+    (Private function. Not to be used directly)
+    Does the search for SpiceEditor.find_subckt_in_lib() and returns the text of the sub-circuit found, or None.
+    The modification time and the size of the library are only used as cache keys.
+    """
+    # 0. Setup things
+    reg_subckt = re.compile(SUBCKT_CLAUSE_FIND + subckt_name, re.IGNORECASE | re.MULTILINE)
+    # 1. Find Encoding
+    encoding = detect_encoding(library)
+    #  2. scan the file. The whole text is searched at once, instead of matching the regex on every line.
+    with open(library, encoding=encoding) as lib:
+        text = lib.read()
+    search = reg_subckt.search(text)
+    if search:
+        lines = io.StringIO(text[search.start():])  # Iterates over the lines like the file would
+        sub_circuit = SpiceCircuit()
+        sub_circuit.netlist.append(next(lines))
+        # Advance to the next non nested .ENDS
+        finished = sub_circuit._add_lines(lines)
+        if finished:
+            return sub_circuit.to_string()
+    #  3. Return the text of the sub-circuit
+    return None
+
+
 class UnrecognizedSyntaxError(Exception):
     """Line doesn't match expected Spice syntax"""
 
@@ -163,6 +368,22 @@ class MissingExpectedClauseError(Exception):
     """Missing expected clause in Spice netlist"""
 
 
+def _copy_netlist(netlist: list) -> list:
+    """
+    (Private function. Not to be used directly)
+    Returns a copy of the netlist lines where the sub-circuits are also copied, so that the edits done on the copy
+    don't affect the original.
+    """
+    lines = []
+    for line in netlist:
+        if isinstance(line, SpiceCircuit):
+            sub_circuit = SpiceCircuit()
+            sub_circuit.netlist = _copy_netlist(line.netlist)
+            line = sub_circuit
+        lines.append(line)
+    return lines
+
+
 class SpiceCircuit(BaseEditor):
     """
     Represents sub-circuits within a SPICE circuit. Since sub-circuits can have sub-circuits inside
@@ -173,18 +394,56 @@ class SpiceCircuit(BaseEditor):
     def __init__(self):
         super().__init__()
         self.netlist = []
+        self._designator_index = {}  # Maps the upper-cased first token of each line to its first line number
+        self._param_index = {}  # Maps the lower-cased parameter names to the .PARAM line where they were found
+        self._backanno_line = None  # Where the .backanno instruction was last found
 
-    def _get_line_starting_with(self, substr: str) -> int:
+    def _get_insert_line(self) -> int:
+        """Internal function. Do not use.
+        Returns the line where new lines are added to the netlist, that is, just before the .backanno instruction."""
+        # The position of the .backanno is kept, and it is only searched again if the line there is not the .backanno
+        line_no = self._backanno_line
+        if line_no is None or line_no >= len(self.netlist) or self.netlist[line_no] != '.backanno\n':
+            try:
+                # TODO: Improve this. END of line termination could be differnt and case as well
+                line_no = self.netlist.index('.backanno\n')
+            except ValueError:
+                self._backanno_line = None
+                return len(self.netlist) - 2  # This is where typically the .backanno instruction is
+            self._backanno_line = line_no
+        return line_no
+
+    def _insert_lines(self, line_no: int, lines: list) -> None:
+        """Internal function. Do not use.
+        Inserts the lines at the given position, keeping track of the position of the .backanno instruction."""
+        self.netlist[line_no:line_no] = lines
+        if self._backanno_line is not None and line_no <= self._backanno_line:
+            self._backanno_line += len(lines)
+
+    def _build_designator_index(self) -> None:
         """Internal function. Do not use."""
-        # This function returns the line number that starts with the substr string.
-        # If the line is not found, then -1 is returned.
-        substr_upper = substr.upper()
+        index = {}
         for line_no, line in enumerate(self.netlist):
             if isinstance(line, SpiceCircuit):  # If it is a sub-circuit it will simply ignore it.
                 continue
-            line_upcase = _first_token_upped(line)
-            if line_upcase == substr_upper:
+            index.setdefault(_first_token_upped(line), line_no)
+        self._designator_index = index
+
+    def _get_line_starting_with(self, substr: str) -> int:
+        """Internal function. Do not use."""
+        # This function returns the line number that starts with the substr string.
+        # The netlist can be changed without the index knowing it, so the line found is checked before being
+        # returned, and the index is rebuilt if it's stale.
+        substr_upper = substr.upper()
+        line_no = self._designator_index.get(substr_upper)
+        if line_no is not None and line_no < len(self.netlist):
+            line = self.netlist[line_no]
+            if isinstance(line, str) and _first_token_upped(line) == substr_upper:
                 return line_no
+        self._build_designator_index()
+        line_no = self._designator_index.get(substr_upper)
+        if line_no is not None:
+            return line_no
         error_msg = "line starting with '%s' not found in netlist" % substr
         _logger.error(error_msg)
         raise ComponentNotFoundError(error_msg)
@@ -192,8 +451,20 @@ class SpiceCircuit(BaseEditor):
     def _add_lines(self, line_iter):
         """Internal function. Do not use.
         Add a list of lines to the netlist."""
+        # The continuation lines are collected and joined to the line they continue all at once, when the next
+        # statement starts, instead of concatenating them one by one.
+        continuation = []
         for line in line_iter:
             cmd = get_line_command(line)
+            if cmd == '+':
+                assert len(self.netlist) > 0, "ERROR: The first line cannot be starting with a +"
+                if not continuation:
+                    continuation.append(self.netlist[-1])
+                continuation.append(line)  # Appends to the last line
+                continue
+            if continuation:
+                self.netlist[-1] = ''.join(continuation)
+                continuation.clear()
             if cmd == '.SUBCKT':
                 sub_circuit = SpiceCircuit()
                 sub_circuit.netlist.append(line)
@@ -203,42 +474,58 @@ class SpiceCircuit(BaseEditor):
                     self.netlist.append(sub_circuit)
                 else:
                     return False
-            elif cmd == '+':
-                assert len(self.netlist) > 0, "ERROR: The first line cannot be starting with a +"
-                self.netlist[-1] += line  # Appends to the last line
             else:
                 self.netlist.append(line)
                 if cmd[:4] == '.END':  # True for either .END and .ENDS primitives
                     return True  # If a sub-circuit is ended correctly, returns True
+        if continuation:
+            self.netlist[-1] = ''.join(continuation)
         return False  # If a sub-circuit ends abruptly, returns False
 
-    def write_lines(self, f):
-        """Internal function. Do not use."""
-        # This helper function writes the contents of sub-circuit to the file f
+    def _iter_strings(self):
+        """Internal function. Do not use.
+        Yields all the lines of the netlist, including the ones of the sub-circuits."""
         for command in self.netlist:
             if isinstance(command, SpiceCircuit):
-                command.write_lines(f)
+                yield from command._iter_strings()
             else:
-                f.write(command)
+                yield command
 
-    def _get_line_matching(self, command, search_expression: re.Pattern) -> Tuple[int, Union[re.Match, None]]:
+    def write_lines(self, f):
+        """Internal function. Do not use."""
+        # This helper function writes the contents of sub-circuit to the file f
+        f.writelines(self._iter_strings())
+
+    def _lines_with_command(self, command: str):
+        """Internal function. Do not use.
+        Yields the line number and the line of all the lines of the netlist with the given command. Sub-circuits are
+        skipped."""
+        for line_no, line in enumerate(self.netlist):
+            if isinstance(line, str) and _str_line_command(line) == command:
+                yield line_no, line
+
+    def _get_param_line(self, param: str) -> Tuple[int, Union[Tuple[int, int], None]]:
         """
-        Internal function. Do not use. Returns a line starting with command and matching the search with the regular
-        expression
+        Internal function. Do not use. Returns the .PARAM line where the parameter is assigned, and the span of the
+        assignment on that line.
         """
-        line_no = 0
-        while line_no < len(self.netlist):
+        # The line where the parameter was last found is tried first. As the netlist can be changed without the
+        # index knowing it, the line is checked, and the whole netlist is searched again if it's stale.
+        key = param.lower()
+        line_no = self._param_index.get(key)
+        if line_no is not None and line_no < len(self.netlist):
             line = self.netlist[line_no]
-            if isinstance(line, SpiceCircuit):  # If it is a sub-circuit it will simply ignore it.
-                line_no += 1
-                continue
-            cmd = get_line_command(line)
-            if cmd == command:
-                match = search_expression.search(line)
-                if match:
-                    return line_no, match
-            line_no += 1
-        return -1, None  # If it fails, it returns an invalid line number and No match
+            if isinstance(line, str) and get_line_command(line) == '.PARAM':
+                span = find_param(line, param)
+                if span:
+                    return line_no, span
+        for line_no, line in self._lines_with_command('.PARAM'):
+            span = find_param(line, param)
+            if span:
+                self._param_index[key] = line_no
+                return line_no, span
+        self._param_index.pop(key, None)
+        return -1, None  # If it fails, it returns an invalid line number and no span
 
     def get_subcircuit(self, instance_name: str) -> 'SpiceCircuit':
         """
@@ -250,7 +537,6 @@ class SpiceCircuit(BaseEditor):
         :raises UnrecognizedSyntaxError: when an spice command is not recognized by spicelib
         :raises ComponentNotFoundError: When the reference was not found
         """
-        global LibSearchPaths
         if SUBCKT_DIVIDER in instance_name:
             subckt_ref, sub_subckts = instance_name.split(SUBCKT_DIVIDER, 1)
         else:
@@ -258,12 +544,13 @@ class SpiceCircuit(BaseEditor):
 
         line_no = self._get_line_starting_with(subckt_ref)
         sub_circuit_instance = self.netlist[line_no]
-        regex = component_replace_regexs['X']  # The sub-circuit instance regex
-        m = regex.search(sub_circuit_instance)
-        if m:
-            subcircuit_name = m.group('value')  # last_token of the line before Params:
-        else:
-            raise UnrecognizedSyntaxError(sub_circuit_instance, REPLACE_REGXES['X'])
+        subcircuit_name = _subcircuit_name(sub_circuit_instance)
+        if subcircuit_name is None:  # Tokenizing didn't work. Resorting to the sub-circuit instance regex
+            m = component_replace_regexs['X'].search(sub_circuit_instance)
+            if m:
+                subcircuit_name = m.group('value')  # last_token of the line before Params:
+            else:
+                raise UnrecognizedSyntaxError(sub_circuit_instance, REPLACE_REGXES['X'])
 
         # Search for the sub-circuit in the netlist
         sub_circuit = SpiceEditor.find_subckt_in_lib(self.circuit_file, subcircuit_name)
@@ -271,21 +558,16 @@ class SpiceCircuit(BaseEditor):
         if sub_circuit is None:  # If it was not found in the netlist, search on the declared libraries
             # If we reached here is because the subcircuit was not found. Search for it in declared libraries
             for line in self.netlist:
+                if isinstance(line, SpiceCircuit):
+                    continue
                 m = lib_inc_regex.match(line)
                 if m:  # If it is a library include
-                    lib = m.group(2)
-                    if os.path.exists(lib):
-                        lib_filename = os.path.join(os.path.expanduser('~'), "Documents\\LTspiceXVII\\lib\\sub", lib)
-                        if os.path.exists(lib_filename):
-                            sub_circuit = SpiceEditor.find_subckt_in_lib(lib_filename, subcircuit_name)
-                            if sub_circuit:
-                                break
-                    for path in LibSearchPaths:
-                        lib_filename = os.path.join(path, lib)
-                        if os.path.exists(lib_filename):
-                            sub_circuit = SpiceEditor.find_subckt_in_lib(lib_filename, subcircuit_name)
-                            if sub_circuit:
-                                break
+                    for lib_filename in _find_library_files(m.group(2), tuple(LibSearchPaths)):
+                        sub_circuit = SpiceEditor.find_subckt_in_lib(lib_filename, subcircuit_name)
+                        if sub_circuit:
+                            break
+                    if sub_circuit:
+                        break
 
         if sub_circuit:
             if SUBCKT_DIVIDER in instance_name:
@@ -313,7 +595,7 @@ class SpiceCircuit(BaseEditor):
         line_no = self._get_line_starting_with(component)
 
         line = self.netlist[line_no]
-        m = regex.match(line)
+        m = _match_component(prefix, regex, line)
         if m is None:
             raise UnrecognizedSyntaxError(line, REPLACE_REGXES[prefix])
         else:
@@ -349,6 +631,44 @@ class SpiceCircuit(BaseEditor):
             clone.setname(new_name)
         return clone
 
+    def to_string(self) -> str:
+        """
+        Returns the text of the netlist, including the one of its sub-circuits, as it would be written to a file.
+
+        :return: Netlist text
+        :rtype: str
+        """
+        return ''.join(self._iter_strings())
+
+    @staticmethod
+    def from_string(text: str) -> 'SpiceCircuit':
+        """
+        Creates a SpiceCircuit from the text of a sub-circuit, such as the one returned by to_string(). The lines
+        before the .SUBCKT clause and after the matching .ENDS are kept as they are. The lines before the .SUBCKT
+        are classified while looking for it, so they must be valid netlist lines: comments, directives or
+        components.
+
+        :param text: Text containing a sub-circuit definition
+        :type text: str
+        :return: The SpiceCircuit object representing the sub-circuit
+        :rtype: SpiceCircuit
+        :raises SyntaxError: When the .SUBCKT or the .ENDS clauses are missing, or when a line before the .SUBCKT,
+            or inside the sub-circuit, isn't recognized as a netlist line.
+        """
+        sub_circuit = SpiceCircuit()
+        lines = iter(io.StringIO(text))  # Splits the lines the same way file iteration does
+        for line in lines:
+            sub_circuit.netlist.append(line)
+            if get_line_command(line) == '.SUBCKT':
+                # Advance to the next non nested .ENDS
+                if not sub_circuit._add_lines(lines):
+                    raise SyntaxError("Sub-circuit with missing .ENDS statement")
+                break
+        else:
+            raise SyntaxError("Unable to find .SUBCKT clause in text")
+        sub_circuit.netlist.extend(lines)
+        return sub_circuit
+
     def name(self) -> str:
         """
         Returns the name of the Sub-Circuit.
@@ -432,7 +752,7 @@ class SpiceCircuit(BaseEditor):
 
         line_no = self._get_line_starting_with(reference)
         line = self.netlist[line_no]
-        m = regex.match(line)
+        m = _match_component(prefix, regex, line)
         if m is None:
             error_msg = 'Unsupported line "{}"\nExpected format is "{}"'.format(line, REPLACE_REGXES[prefix])
             _logger.error(error_msg)
@@ -456,8 +776,9 @@ class SpiceCircuit(BaseEditor):
         """
         component_info = self.get_component_info(reference)
         component = Component()
-        component.reference = reference
-        component.ports = component_info['nodes'].split()
+        component.reference = sys.intern(reference)
+        # Node names are repeated all over the netlist, so all the components share the same strings
+        component.ports = [sys.intern(node) for node in component_info['nodes'].split()]
         for attr in component_info:
             if attr not in ('designator', 'nodes'):
                 component.attributes[attr] = component_info[attr]
@@ -490,10 +811,10 @@ class SpiceCircuit(BaseEditor):
         :rtype: str
         :raises: ParameterNotFoundError - In case the component is not found
         """
-        regx = re.compile(PARAM_REGEX % param, re.IGNORECASE)
-        line_no, match = self._get_line_matching('.PARAM', regx)
-        if match:
-            return match.group('value')
+        line_no, span = self._get_param_line(param)
+        if span:
+            start, stop = span
+            return self.netlist[line_no][start:stop].split('=', 1)[1].lstrip()
         else:
             raise ParameterNotFoundError(param)
 
@@ -519,17 +840,33 @@ class SpiceCircuit(BaseEditor):
 
         :return: Nothing
         """
-        regx = re.compile(PARAM_REGEX % param, re.IGNORECASE)
-        param_line, match = self._get_line_matching('.PARAM', regx)
-        if match:
-            start, stop = match.span(regx.groupindex['replace'])
+        param_line, span = self._get_param_line(param)
+        if span:
+            start, stop = span
             line: str = self.netlist[param_line]
             self.netlist[param_line] = line[:start] + "{}={}".format(param, value) + line[stop:]
         else:
             # Was not found
             # the last two lines are typically (.backano and .end)
             insert_line = len(self.netlist) - 2
-            self.netlist.insert(insert_line, '.PARAM {}={}  ; Batch instruction'.format(param, value) + END_LINE_TERM)
+            self._insert_lines(insert_line, ['.PARAM {}={}  ; Batch instruction'.format(param, value) + END_LINE_TERM])
+
+    def set_parameters(self, **kwargs):
+        # docstring is in the parent class
+        # All parameters are updated on a single pass over the netlist, instead of one pass for each parameter
+        pending = dict(kwargs)
+        for line_no, line in self._lines_with_command('.PARAM'):
+            if not pending:
+                break
+            for param in list(pending):
+                span = find_param(line, param)
+                if span:
+                    start, stop = span
+                    line = line[:start] + "{}={}".format(param, pending.pop(param)) + line[stop:]
+            self.netlist[line_no] = line
+        # The ones that weren't found are added to the netlist
+        for param, value in pending.items():
+            self.set_parameter(param, value)
 
     def set_component_value(self, device: str, value: Union[str, int, float]) -> None:
         """
@@ -628,16 +965,15 @@ class SpiceCircuit(BaseEditor):
         answer = []
         if prefixes == '*':
             prefixes = ''.join(REPLACE_REGXES.keys())
+        prefixes = frozenset(prefixes)
         for line in self.netlist:
             if isinstance(line, SpiceCircuit):  # Only gets components from the main netlist,
                 # it currently skips sub-circuits
                 continue
-            tokens = line.split()
-            try:
-                if tokens[0][0] in prefixes:
-                    answer.append(tokens[0])  # Appends only the designators
-            except IndexError or TypeError:
-                pass
+            # Comments, directives and blank lines are discarded by their first character, without splitting them
+            stripped = line.lstrip(' \t')
+            if stripped and stripped[0] in prefixes:
+                answer.append(stripped.split(None, 1)[0])  # Appends only the designators
         return answer
 
     def add_component(self, component: Component, **kwargs) -> None:
@@ -654,23 +990,31 @@ class SpiceCircuit(BaseEditor):
             * **insert_after** (str) - The reference of the component after which the new component should be inserted.
         :return: Nothing
         """
+        self.add_components(component, **kwargs)
+
+    def add_components(self, *components: Component, **kwargs) -> None:
+        # docstring is in the parent class
+        # The insertion point is only searched once, and all the components are inserted there in a single operation.
+        # The same keyword arguments as add_component() are supported.
         if 'insert_before' in kwargs:
             line_no = self._get_line_starting_with(kwargs['insert_before'])
         elif 'insert_after' in kwargs:
             line_no = self._get_line_starting_with(kwargs['insert_after'])
         else:
-            # Insert before backanno instruction
-            try:
-                line_no = self.netlist.index(
-                    '.backanno\n')  # TODO: Improve this. END of line termination could be differnt
-            except ValueError:
-                line_no = len(self.netlist) - 2
+            line_no = self._get_insert_line()  # Insert before backanno instruction
+        self._insert_lines(line_no, [self._component_line(component) for component in components])
 
+    @staticmethod
+    def _component_line(component: Component) -> str:
+        """Internal function. Do not use.
+        Returns the netlist line of a component."""
         nodes = " ".join(component.ports)
         model = component.attributes.get('model', 'no_model')
-        parameters = " ".join([f"{k}={v}" for k, v in component.attributes.items() if k != 'model'])
-        component_line = f"{component.reference} {nodes} {model} {parameters}{END_LINE_TERM}"
-        self.netlist.insert(line_no, component_line)
+        extras = [k for k in component.attributes if k != 'model']
+        if extras:
+            parameters = " ".join(f"{k}={component.attributes[k]}" for k in extras)
+            return f"{component.reference} {nodes} {model} {parameters}{END_LINE_TERM}"
+        return f"{component.reference} {nodes} {model}{END_LINE_TERM}"
 
     def remove_component(self, designator: str) -> None:
         """
@@ -694,16 +1038,19 @@ class SpiceCircuit(BaseEditor):
         paths then the paths added by this method will be searched.
         Alternatively spicelib.SpiceEditor.LibSearchPaths.append(paths) can be used."
 
-        :param paths: Path to add to the Search path
+        :param paths: Path to add to the Search path. Paths that were already added are ignored.
         :type paths: str
         :return: Nothing
         :rtype: None
         """
-        global LibSearchPaths
-        if isinstance(paths, str):
-            LibSearchPaths.append(paths)
-        elif isinstance(paths, list):
-            LibSearchPaths += paths
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        elif not isinstance(paths, list):
+            return
+        for path in paths:
+            path = os.path.normpath(os.fspath(path))
+            if path not in LibSearchPaths:  # Paths already added are not searched twice
+                LibSearchPaths.append(path)
 
     def get_all_nodes(self) -> List[str]:
         """
@@ -712,17 +1059,16 @@ class SpiceCircuit(BaseEditor):
         :returns: Circuit Nodes
         :rtype: list[str]
         """
-        circuit_nodes = []
+        circuit_nodes = {}  # Used as an ordered set
         for line in self.netlist:
             prefix = get_line_command(line)
-            if prefix in component_replace_regexs:
-                match = component_replace_regexs[prefix].match(line)
+            regex = component_replace_regexs.get(prefix)
+            if regex is not None and 'nodes' in regex.groupindex:
+                match = _match_component(prefix, regex, line)
                 if match:
-                    nodes = match.group('nodes').split()  # This separates by all space characters including \t
-                    for node in nodes:
-                        if node not in circuit_nodes:
-                            circuit_nodes.append(node)
-        return circuit_nodes
+                    # This separates by all space characters including \t
+                    circuit_nodes.update(dict.fromkeys(map(sys.intern, match.group('nodes').split())))
+        return list(circuit_nodes)
 
     def save_netlist(self, run_netlist_file: Union[str, Path]) -> None:
         # docstring is in the parent class
@@ -766,6 +1112,9 @@ class SpiceEditor(SpiceCircuit):
         super().__init__()
         self.netlist_file = Path(netlist_file)
         self.modified_subcircuits = {}
+        self._baseline = None  # Copy of the netlist as it was read from the file, used by reset_netlist()
+        self._baseline_version = None  # File modification time, size and encoding of the baseline
+        self._end_line = None  # Where the .END instruction was last found
         if create_blank:
             self.encoding = 'utf-8'  # when user want to create a blank netlist file, and didn't set encoding.
         else:
@@ -783,18 +1132,16 @@ class SpiceEditor(SpiceCircuit):
         return self.netlist_file
 
     def get_component_info(self, component) -> dict:
-        prefix = component[0]
-        if prefix == 'X' and SUBCKT_DIVIDER in component:  # Replaces a component inside of a subciruit
+        if _is_hier(component):  # Replaces a component inside of a subciruit
             # In this case the sub-circuit needs to be copied so that is copy is modified. A copy is created for each
             # instance of a sub-circuit.
-            component_split = component.split(SUBCKT_DIVIDER)
-            modified_path = SUBCKT_DIVIDER.join(component_split[:-1])  # excludes last component
-            component = component_split[-1]  # This is the last component to modify
+            # The path excludes the last component, which is the one to modify
+            modified_path, _, component = component.rpartition(SUBCKT_DIVIDER)
 
             if modified_path in self.modified_subcircuits:  # See if this was already a modified sub-circuit instance
                 subcircuit = self.modified_subcircuits[modified_path]
             else:
-                subcircuit = self.get_subcircuit(component)
+                subcircuit = self.get_subcircuit(modified_path)
             return subcircuit.get_component_info(component)
 
         return super().get_component_info(component)
@@ -803,21 +1150,19 @@ class SpiceEditor(SpiceCircuit):
         """
         Internal method to set the model and value of a component.
         """
-        prefix = component[0]  # Using the first letter of the component to identify what is it
-        if prefix == 'X' and SUBCKT_DIVIDER in component:  # Relaces a component inside of a subciruit
+        if _is_hier(component):  # Relaces a component inside of a subciruit
             # In this case the sub-circuit needs to be copied so that is copy is modified. A copy is created for each
             # instance of a sub-circuit.
-            component_split = component.split(SUBCKT_DIVIDER)
-            modified_path = SUBCKT_DIVIDER.join(component_split[:-1])  # excludes last component
-            component = component_split[-1]  # This is the last component to modify
+            # The path excludes the last component, which is the one to modify
+            modified_path, _, component = component.rpartition(SUBCKT_DIVIDER)
 
             if modified_path in self.modified_subcircuits:  # See if this was already a modified sub-circuit instance
                 sub_circuit = self.modified_subcircuits[modified_path]
             else:
                 sub_circuit_original = self.get_subcircuit(modified_path)  # If not will look for it.
                 if sub_circuit_original:
-                    new_name = sub_circuit_original.name() + '_' + '_'.join(
-                        component_split[:-1])  # Creates a new name with the path appended
+                    # Creates a new name with the path appended
+                    new_name = sub_circuit_original.name() + '_' + modified_path.replace(SUBCKT_DIVIDER, '_')
                     sub_circuit = sub_circuit_original.clone(new_name=new_name)
                     # Memorize that the copy is relative to that particular instance
                     self.modified_subcircuits[modified_path] = sub_circuit
@@ -850,29 +1195,46 @@ class SpiceEditor(SpiceCircuit):
         """
         if not instruction.endswith(END_LINE_TERM):
             instruction += END_LINE_TERM
-        if _is_unique_instruction(instruction):
+        unique = _is_unique_instruction(instruction)
+        if unique:
             # Before adding new instruction, delete previously set unique instructions
-            i = 0
-            while i < len(self.netlist):
-                line = self.netlist[i]
-                if _is_unique_instruction(line):
-                    self.netlist[i] = instruction
-                    break
-                else:
-                    i += 1
+            i = next((i for i, line in enumerate(self.netlist) if _is_unique_instruction(line)), None)
+            if i is not None:
+                self.netlist[i] = instruction
+                return  # The instruction took the place of the previous one, so there's nothing else to check
         elif get_line_command(instruction) == '.PARAM':
             raise RuntimeError('The .PARAM instruction should be added using the "set_parameter" method')
 
         # check whether the instruction is already there (dummy proofing)
         # TODO: if adding a .MODEL or .SUBCKT it should verify if it already exists and update it.
-        if instruction not in self.netlist:
-            # Insert before backanno instruction
-            try:
-                line = self.netlist.index(
-                    '.backanno\n')  # TODO: Improve this. END of line termination could be differnt and case as well
-            except ValueError:
-                line = len(self.netlist) - 2  # This is where typically the .backanno instruction is
-            self.netlist.insert(line, instruction)
+        # A unique instruction that wasn't found in the search above can't be in the netlist either.
+        if unique or instruction not in self.netlist:
+            self._insert_lines(self._get_insert_line(), [instruction])  # Insert before backanno instruction
+
+    def add_instructions(self, *instructions) -> None:
+        # docstring is in the parent class
+        # The result is the same as calling add_instruction() for each instruction, but the insertion point is only
+        # searched once, and all the new instructions are inserted there in a single operation.
+        instructions = [instr if instr.endswith(END_LINE_TERM) else instr + END_LINE_TERM for instr in instructions]
+        for instruction in instructions:
+            if get_line_command(instruction) == '.PARAM':
+                raise RuntimeError('The .PARAM instruction should be added using the "set_parameter" method')
+        insert_line = self._get_insert_line()  # Insert before backanno instruction
+        new_lines = []
+        for instruction in instructions:
+            if _is_unique_instruction(instruction):
+                # Replaces the first unique instruction found. The lines being added are placed at insert_line.
+                for lines, start, stop in ((self.netlist, 0, insert_line),
+                                           (new_lines, 0, len(new_lines)),
+                                           (self.netlist, insert_line, len(self.netlist))):
+                    i = next((i for i in range(start, stop) if _is_unique_instruction(lines[i])), None)
+                    if i is not None:
+                        lines[i] = instruction
+                        break
+            # check whether the instruction is already there (dummy proofing)
+            if instruction not in self.netlist and instruction not in new_lines:
+                new_lines.append(instruction)
+        self._insert_lines(insert_line, new_lines)
 
     def remove_instruction(self, instruction) -> None:
         # docstring is in the parent class
@@ -890,18 +1252,19 @@ class SpiceEditor(SpiceCircuit):
 
     def remove_Xinstruction(self, search_pattern: str) -> None:
         # docstring is in the parent class
-        regex = re.compile(search_pattern, re.IGNORECASE)
-        i = 0
+        regex = _search_regex(search_pattern)
+        # The lines to keep are collected in a single pass, instead of deleting the matching lines one by one
+        kept = []
         instr_removed = False
-        while i < len(self.netlist):
-            line = self.netlist[i]
+        for line in self.netlist:
             if isinstance(line, str) and regex.match(line):
-                del self.netlist[i]
                 instr_removed = True
                 _logger.info(f'Instruction "{line}" removed')
             else:
-                i += 1
-        if not instr_removed:
+                kept.append(line)
+        if instr_removed:
+            self.netlist[:] = kept
+        else:
             _logger.error(f'No instruction matching pattern "{search_pattern}" was found')
 
     def save_netlist(self, run_netlist_file: Union[str, Path]) -> None:
@@ -909,18 +1272,34 @@ class SpiceEditor(SpiceCircuit):
         if isinstance(run_netlist_file, str):
             run_netlist_file = Path(run_netlist_file)
         run_netlist_file = run_netlist_file.with_suffix('.net')
+        text = ''.join(self._iter_output_lines())  # The whole netlist is encoded and written at once
         with open(run_netlist_file, 'w', encoding=self.encoding) as f:
-            lines = iter(self.netlist)
-            for line in lines:
-                if isinstance(line, SpiceCircuit):
-                    line.write_lines(f)
-                else:
-                    # Writes the modified sub-circuits at the end just before the .END clause
-                    if line.upper().startswith(".END"):
-                        # write here the modified sub-circuits
-                        for sub in self.modified_subcircuits.values():
-                            sub.write_lines(f)
-                    f.write(line)
+            f.write(text)
+
+    def _iter_output_lines(self):
+        """Internal function. Do not use.
+        Yields the lines to be written on the netlist file, including the modified sub-circuits."""
+        # Writes the modified sub-circuits at the end just before the .END clause
+        end_line = self._get_end_line() if self.modified_subcircuits else None
+        for line_no, line in enumerate(self.netlist):
+            if isinstance(line, SpiceCircuit):
+                yield from line._iter_strings()
+            else:
+                if line_no == end_line:
+                    # write here the modified sub-circuits, as a single block of text
+                    yield ''.join(sub.to_string() for sub in self.modified_subcircuits.values())
+                yield line
+
+    def _get_end_line(self) -> Union[int, None]:
+        """Internal function. Do not use.
+        Returns the line of the .END instruction, or None if the netlist doesn't have one."""
+        # The position of the .END is kept, and it is only searched again if the line there is not the .END
+        line_no = self._end_line
+        if line_no is None or line_no >= len(self.netlist) or not _is_end_line(self.netlist[line_no]):
+            # The search starts at the bottom, as the .END is normally the last line of the netlist
+            line_no = next((i for i in range(len(self.netlist) - 1, -1, -1) if _is_end_line(self.netlist[i])), None)
+            self._end_line = line_no
+        return line_no
 
     def reset_netlist(self, create_blank: bool = False) -> None:
         """
@@ -936,6 +1315,12 @@ class SpiceEditor(SpiceCircuit):
             if not finished:
                 raise SyntaxError("Netlist with missing .END or .ENDS statements")
         elif self.netlist_file.exists():
+            stat = self.netlist_file.stat()
+            version = (stat.st_mtime_ns, stat.st_size, self.encoding)
+            if version == self._baseline_version:
+                # The file didn't change since it was read, so there is no need to read and parse it again
+                self.netlist.extend(_copy_netlist(self._baseline))
+                return
             with open(self.netlist_file, 'r', encoding=self.encoding, errors='replace') as f:
                 lines = iter(f)  # Creates an iterator object to consume the file
                 finished = self._add_lines(lines)
@@ -944,6 +1329,8 @@ class SpiceEditor(SpiceCircuit):
                 # else:
                 #     for _ in lines:  # Consuming the rest of the file.
                 #         pass  # print("Ignoring %s" % _)
+            self._baseline = _copy_netlist(self.netlist)
+            self._baseline_version = version
         else:
             _logger.error("Netlist file not found: {}".format(self.netlist_file))
 
@@ -959,23 +1346,13 @@ class SpiceEditor(SpiceCircuit):
         :return: Returns a SpiceCircuit instance with the sub-circuit found or None if not found
         :rtype: SpiceCircuit
         """
-        # 0. Setup things
-        reg_subckt = re.compile(SUBCKT_CLAUSE_FIND + subckt_name, re.IGNORECASE)
-        # 1. Find Encoding
-        encoding = detect_encoding(library)
-        #  2. scan the file
-        with open(library, encoding=encoding) as lib:
-            for line in lib:
-                search = reg_subckt.match(line)
-                if search:
-                    sub_circuit = SpiceCircuit()
-                    sub_circuit.netlist.append(line)
-                    # Advance to the next non nested .ENDS
-                    finished = sub_circuit._add_lines(lib)
-                    if finished:
-                        return sub_circuit
-        #  3. Return an instance of SpiceCircuit
-        return None
+        # The search is cached for each version of the library file, and a new copy is returned every time.
+        library = os.path.abspath(library)
+        stat = os.stat(library)
+        text = _find_subckt_text(library, stat.st_mtime_ns, stat.st_size, subckt_name)
+        if text is None:
+            return None
+        return SpiceCircuit.from_string(text)
 
     def run(self, wait_resource: bool = True,
             callback: Callable[[str, str], Any] = None, timeout: float = None, run_filename: str = None, simulator=None):
@@ -24,8 +24,10 @@ International Support functions
 Not using other known unicode detection libraries because we don't need something so complicated. LTSpice only supports
 for the time being a reduced set of encodings.
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
+import os
 import re
 
 
@@ -52,6 +54,16 @@ def detect_encoding(file_path: Union[str, Path], expected_pattern: str = '', re_
 
     :rtype: str
     """
+    # The detection is cached. The modification time and the size of the file are part of the key, so that a file
+    # that changed on disk is detected again.
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    return _detect_encoding(file_path, stat.st_mtime_ns, stat.st_size, expected_pattern, re_flags)
+
+
+@lru_cache(maxsize=256)
+def _detect_encoding(file_path: str, mtime_ns: int, size: int, expected_pattern: str, re_flags: re.RegexFlag) -> str:
+    """Does the detection for detect_encoding(). The modification time and the size are only used as cache keys."""
     for encoding in ('utf-8', 'utf_16_le', 'cp1252', 'cp1250', 'shift_jis'):
         try:
             with open(file_path, 'r', encoding=encoding) as f:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+# -------------------------------------------------------------------------------
+#
+#  ███████╗██████╗ ██╗ ██████╗███████╗██╗     ██╗██████╗
+#  ██╔════╝██╔══██╗██║██╔════╝██╔════╝██║     ██║██╔══██╗
+#  ███████╗██████╔╝██║██║     █████╗  ██║     ██║██████╔╝
+#  ╚════██║██╔═══╝ ██║██║     ██╔══╝  ██║     ██║██╔══██╗
+#  ███████║██║     ██║╚██████╗███████╗███████╗██║██████╔╝
+#  ╚══════╝╚═╝     ╚═╝ ╚═════╝╚══════╝╚══════╝╚═╝╚═════╝
+#
+# Name:        test_base_editor.py
+# Purpose:     Tool used validate the helper functions shared by the editors
+#
+# Author:      Nuno Brum (nuno.brum@gmail.com)
+#
+# Licence:     refer to the LICENSE file
+# -------------------------------------------------------------------------------
+
+import os
+import sys
+import unittest
+
+sys.path.append(
+    os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../")))  # add project root to lib search path
+
+from spicelib.editor.base_editor import find_param, get_param_regex, format_eng, scan_eng, Component
+from spicelib.editor.spice_editor import SpiceEditor
+
+
+class BaseEditor_Test(unittest.TestCase):
+
+    def test_find_param(self):
+        lines = (
+            ".PARAM TEMP=0\n",
+            ".param temp = 25 res=1k\n",
+            ".param res=1k temp={a + b} cap=1u\n",
+            ".param xtemp=1 temp=2\n",
+            ".param res=1k\n",
+            ".param temp= cap=1\n",
+        )
+        for line in lines:
+            m = get_param_regex('TEMP').search(line)
+            span = find_param(line, 'TEMP')
+            self.assertEqual(m.span('replace') if m else None, span, line)
+            if span:
+                value = line[span[0]:span[1]].split('=', 1)[1].lstrip()
+                self.assertEqual(m.group('value'), value, line)
+        self.assertEqual(find_param(".param temp = 25 res=1k\n", 'temp'), (7, 16))
+        self.assertIsNone(find_param(".param res=1k\n", 'temp'))
+
+    def test_format_eng(self):
+        self.assertEqual(format_eng(1e3), '1k')
+        self.assertEqual(format_eng(4.7e-9), '4.7n')
+        self.assertEqual(format_eng(25), '25')
+        self.assertEqual(format_eng(-0.0), '-0')
+        self.assertEqual(format_eng(0.0), '0', "The result for -0.0 isn't reused for 0.0")
+        self.assertEqual(format_eng(0), '0')
+
+    def test_scan_eng(self):
+        self.assertEqual(scan_eng('1k'), 1e3)
+        self.assertEqual(scan_eng('1K'), 1e3)
+        self.assertAlmostEqual(scan_eng('10u'), 10e-6)
+        self.assertAlmostEqual(scan_eng('10µF'), 10e-6)
+        self.assertAlmostEqual(scan_eng('2.2nF'), 2.2e-9)
+        self.assertEqual(scan_eng('1.5Meg'), 1.5e6)
+        self.assertEqual(scan_eng(' 4.7KΩ '), 4.7e3)
+        self.assertEqual(scan_eng('10Ohm'), 10.0)
+        self.assertRaises(ValueError, scan_eng, 'x')
+
+    def test_component_from_line(self):
+        component = Component.from_line("R1 in out 10k\n")
+        self.assertEqual(component.reference, 'R1')
+        self.assertListEqual(component.ports, ['in', 'out'])
+        self.assertEqual(component.attributes['value'], '10k')
+        self.assertEqual(component, Component.from_line("R1 a b 1k"), "Components are compared by reference")
+        self.assertRaises(ValueError, Component.from_line, "R1\n")
+
+    def test_write_netlist(self):
+        self.assertIs(SpiceEditor.write_netlist, SpiceEditor.save_netlist, "Deprecated alias is bound")
+
+        class Editor(SpiceEditor):
+            def write_netlist(self, run_netlist_file):
+                pass
+
+        class SubEditor(Editor):
+            pass
+
+        self.assertIs(SubEditor.write_netlist, Editor.__dict__['write_netlist'], "Own write_netlist is kept")
+
+
+if __name__ == '__main__':
+    unittest.main()
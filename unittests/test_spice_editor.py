@@ -47,6 +47,72 @@ class SpiceEditor_Test(unittest.TestCase):
         self.edt.save_netlist(test_dir + 'test_components_output_1.net')
         self.equalFiles(test_dir + 'test_components_output_1.net', golden_dir + 'test_components_output_1.net')
 
+    def test_lower_case_designators(self):
+        # Only the designators that can be edited are returned, and their prefixes are case-sensitive
+        self.edt.netlist.insert(1, "r9 in 0 1k\n")
+        self.edt.netlist.insert(1, "c9 out 0 1n\n")
+        self.assertListEqual(self.edt.get_components(), ['Vin', 'R1', 'R2', 'D1'], "Tested get_components")
+        self.assertListEqual(self.edt.get_components('RC'), ['R1', 'R2'], "Tested get_components")
+
+    def test_netlist_changed_externally(self):
+        self.assertEqual(self.edt.get_component_value('R2'), '{res}', "Tested R2 Value")
+        self.assertEqual(self.edt.get_parameter('res'), '10k', "Tested res Parameter")
+        self.edt.netlist.insert(1, "R9 in 0 1k\n")  # Shifts all the lines below
+        self.assertEqual(self.edt.get_parameter('res'), '10k', "Tested res Parameter")
+        self.edt.netlist[9] = ".param res=22k\n"  # Replaces the .param line
+        self.assertEqual(self.edt.get_parameter('res'), '22k', "Tested res Parameter")
+        self.edt.netlist[4] = "R1 in out 22k\n"  # Replaces R2 by a second R1
+        self.assertEqual(self.edt.get_component_value('R9'), '1k', "Tested R9 Value")
+        self.assertEqual(self.edt.get_component_value('R1'), '10k', "Tested R1 Value")
+        self.assertRaises(spicelib.editor.base_editor.ComponentNotFoundError, self.edt.get_component_value, 'R2')
+
+    def test_subcircuit_text(self):
+        text = ".SUBCKT divider in out\nR1 in out 10k\nR2 out 0 10k\n.ENDS divider\n"
+        sub_circuit = spicelib.editor.spice_editor.SpiceCircuit.from_string(text)
+        self.assertEqual(sub_circuit.name(), 'divider', "Tested sub-circuit name")
+        self.assertEqual(sub_circuit.get_component_value('R2'), '10k', "Tested R2 Value")
+        self.assertEqual(sub_circuit.to_string(), text, "Tested to_string")
+        clone = sub_circuit.clone(new_name='divider_1')
+        self.assertEqual(spicelib.editor.spice_editor.SpiceCircuit.from_string(clone.to_string()).to_string(),
+                         clone.to_string(), "Tested the text of a cloned sub-circuit")
+        self.assertRaises(SyntaxError, spicelib.editor.spice_editor.SpiceCircuit.from_string, "R1 a b 1k\n")
+        self.assertRaises(SyntaxError, spicelib.editor.spice_editor.SpiceCircuit.from_string, "%unknown\n" + text)
+        text = ".SUBCKT divider in out\n* page break \x0c R3 in 0 1k\nR1 in out 10k\n.ENDS divider\n"
+        sub_circuit = spicelib.editor.spice_editor.SpiceCircuit.from_string(text)
+        self.assertListEqual(sub_circuit.get_components(), ['R1'], "Tested form feed inside a comment")
+        self.assertEqual(sub_circuit.to_string(), text, "Tested to_string")
+
+    def test_subcircuit_edit(self):
+        edt = spicelib.editor.spice_editor.SpiceEditor(test_dir + "Batch_Test.net")
+        self.assertEqual(edt.get_component_value('XU1:C2'), '10p', "Tested XU1:C2 Value")
+        edt.set_component_value('XU1:C2', '22p')
+        self.assertEqual(edt.get_component_value('XU1:C2'), '22p', "Tested XU1:C2 Value")
+
+    def test_reset_netlist(self):
+        edt = spicelib.editor.spice_editor.SpiceEditor(test_dir + "Batch_Test.net")
+        edt.set_component_value('R1', '33k')
+        sub_circuit = next(line for line in edt.netlist if isinstance(line, spicelib.editor.spice_editor.SpiceCircuit))
+        sub_circuit.set_component_value('C2', '22p')  # Edits the sub-circuit in place
+        edt.reset_netlist()
+        self.assertEqual(edt.get_component_value('R1'), '10K', "Tested R1 Value")
+        sub_circuit = next(line for line in edt.netlist if isinstance(line, spicelib.editor.spice_editor.SpiceCircuit))
+        self.assertEqual(sub_circuit.get_component_value('C2'), '10p', "Tested C2 Value")
+
+    def test_add_components(self):
+        components = []
+        for reference, ports, value in (('R3', ['out', '0'], '1k'), ('C1', ['out', '0'], '1n')):
+            component = spicelib.editor.base_editor.Component()
+            component.reference = reference
+            component.ports = ports
+            component.attributes['model'] = value
+            components.append(component)
+        self.edt.add_components(*components)
+        self.assertListEqual(self.edt.get_components(), ['Vin', 'R1', 'R2', 'D1', 'R3', 'C1'], "Tested get_components")
+        self.assertEqual(self.edt.get_component_value('R3'), '1k', "Tested R3 Value")
+        self.assertEqual(self.edt.get_component_value('C1'), '1n', "Tested C1 Value")
+        self.assertListEqual(self.edt.get_component_nodes('C1'), ['out', '0'], "Tested C1 Nodes")
+        self.assertIn('R3 out 0 1k\n', self.edt.netlist, "Tested line without parameters")
+
     def test_parameter_edit(self):
         self.assertEqual(self.edt.get_parameter('TEMP'), '0', "Tested TEMP Parameter")  # add assertion here
         self.edt.set_parameter('TEMP', 25)
@@ -56,6 +122,14 @@ class SpiceEditor_Test(unittest.TestCase):
         self.edt.set_parameter('TEMP', 0)  # reset to 0
         self.assertEqual(self.edt.get_parameter('TEMP'), '0', "Tested TEMP Parameter")  # add assertion here
 
+    def test_parameters_edit(self):
+        self.edt.set_parameters(TEMP=25, new_param='1k')
+        self.assertEqual(self.edt.get_parameter('TEMP'), '25', "Tested TEMP Parameter")
+        self.assertEqual(self.edt.get_parameter('new_param'), '1k', "Tested new_param Parameter")
+        self.edt.set_parameters(temp=0, NEW_PARAM=2)
+        self.assertEqual(self.edt.get_parameter('TEMP'), '0', "Tested TEMP Parameter")
+        self.assertEqual(self.edt.get_parameter('new_param'), '2', "Tested new_param Parameter")
+
     def test_instructions(self):
         self.edt.add_instruction('.ac dec 10 1 100k')
         self.edt.add_instruction('.save V(vout)')
@@ -71,6 +145,18 @@ class SpiceEditor_Test(unittest.TestCase):
         self.edt.save_netlist(test_dir + 'test_instructions_output_2.net')
         self.equalFiles(test_dir + 'test_instructions_output_2.net', golden_dir + 'test_instructions_output_2.net')
 
+    def test_add_instructions(self):
+        self.edt.add_instructions(
+            '.ac dec 10 1 100k',
+            '.save V(vout)',
+            '.save I(R1)',
+            '.save I(R2)',
+            '.save I(D1)',
+            '.save V(vout)',  # Repeated instructions are not added twice
+        )
+        self.edt.save_netlist(test_dir + 'test_instructions_output.net')
+        self.equalFiles(test_dir + 'test_instructions_output.net', golden_dir + 'test_instructions_output.net')
+
     def equalFiles(self, file1, file2):
         with open(file1, 'r') as f1:
             lines1 = f1.readlines()